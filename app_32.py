@@ -16,11 +16,18 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import datetime as dt
 import io
-import requests
-import boto3
+import asyncio
+import gzip
+import json
+import zipfile
+import socket
+import threading
+import time
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pandas import ExcelWriter
 
 # Configure pandas
@@ -30,35 +37,99 @@ pd.set_option("styler.render.max_elements", 2000000)
 AWS_REGION = "us-east-2"
 API_ENDPOINT = "https://5c9t51huga.execute-api.us-east-2.amazonaws.com/prod/query"
 S3_BUCKET = "traveler-app-uploads"
+API_GZIP = True  # gzip query bodies; turned off for the process if the stage can't decode them
 
 # === S3 Upload Helper ===
-def upload_to_s3(file, asset_id, timeframe, feed_type):
-    """Upload file to S3 which triggers automatic ETL processing"""
+@st.cache_resource(show_spinner=False)
+def _create_s3_client():
+    """Create the shared S3 client (boto3 clients are thread-safe)"""
+    # Imported on first use so page loads don't pay the boto3/botocore import
+    import boto3
+    import botocore.config
+
+    # Keep-alive sockets and a pool large enough for concurrent uploads
+    s3_config = botocore.config.Config(
+        tcp_keepalive=True,
+        max_pool_connections=32,
+        retries={'mode': 'standard', 'max_attempts': 3}
+    )
+
+    # Get AWS credentials from secrets (Streamlit Cloud) or use default (local)
+    if "aws" in st.secrets:
+        return boto3.client(
+            's3',
+            aws_access_key_id=st.secrets["aws"]["aws_access_key_id"],
+            aws_secret_access_key=st.secrets["aws"]["aws_secret_access_key"],
+            region_name=st.secrets["aws"]["aws_region"],
+            config=s3_config
+        )
+    # Use default credentials from aws configure (local development)
+    return boto3.client('s3', region_name=AWS_REGION, config=s3_config)
+
+def _transfer_config():
+    """Concurrent multipart transfers for larger CSV feeds"""
+    from boto3.s3.transfer import TransferConfig
+    return TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        multipart_chunksize=8 * 1024 * 1024,
+        max_concurrency=10,
+        use_threads=True
+    )
+
+def upload_to_s3(s3_client, buf, filename, asset_id, timeframe, feed_type):
+    """Upload an in-memory file snapshot to S3 which triggers automatic ETL processing"""
     try:
-        # Get AWS credentials from secrets (Streamlit Cloud) or use default (local)
-        if "aws" in st.secrets:
-            s3_client = boto3.client(
-                's3',
-                aws_access_key_id=st.secrets["aws"]["aws_access_key_id"],
-                aws_secret_access_key=st.secrets["aws"]["aws_secret_access_key"],
-                region_name=st.secrets["aws"]["aws_region"]
-            )
-        else:
-            # Use default credentials from aws configure (local development)
-            s3_client = boto3.client('s3', region_name=AWS_REGION)
-        
         # Generate S3 key: {asset_id}/{timeframe}/{feed_type}/{filename}
-        filename = file.name
         s3_key = f"{asset_id}/{timeframe}/{feed_type}/{filename}"
         
         # Upload file
-        file.seek(0)  # Reset file pointer
-        s3_client.upload_fileobj(file, S3_BUCKET, s3_key)
+        buf.seek(0)  # Reset buffer pointer
+        s3_client.upload_fileobj(buf, S3_BUCKET, s3_key, Config=_transfer_config())
         
         return True, s3_key
     except Exception as e:
         return False, str(e)
 
+# === API Session ===
+# Reuse the TLS connection to API Gateway across queries.
+# cache_resource keeps one Session alive across Streamlit reruns.
+@st.cache_resource(show_spinner=False)
+def _create_session():
+    # Imported on first use so page loads don't pay the requests/urllib3 import
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection
+    from urllib3.util.retry import Retry
+
+    class _KeepAliveAdapter(HTTPAdapter):
+        """HTTPAdapter with TCP_NODELAY + SO_KEEPALIVE on pooled sockets"""
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            ]
+            super().init_poolmanager(*args, **kwargs)
+
+    session = requests.Session()
+    session.mount("https://", _KeepAliveAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=2, backoff_factor=0.3)
+    ))
+    return session
+
+def _warm_api_connection(session):
+    """Open the TLS connection to API Gateway ahead of the first query"""
+    try:
+        session.get(API_ENDPOINT.rsplit('/', 1)[0] + '/health', timeout=2)
+    except Exception:
+        pass
+
+@st.cache_resource(show_spinner=False)
+def _api_transport():
+    """Process-wide transport flags, remembered across Streamlit reruns"""
+    return {"gzip": API_GZIP, "probed_5xx": False}
+
 # === API Query Helper ===
 def query_aws_api(asset_id, timeframes, report_date, scope_days, custom_ranges, measurements):
     """Query AWS Lambda via API Gateway"""
@@ -72,7 +143,38 @@ def query_aws_api(asset_id, timeframes, report_date, scope_days, custom_ranges,
             "measurements": measurements
         }
         
-        response = requests.post(API_ENDPOINT, json=payload, timeout=30)
+        session = _create_session()
+        transport = _api_transport()
+        
+        if transport["gzip"]:
+            # Gzip the JSON body (level 1 - network dominates, not CPU)
+            # allow_nan=False keeps the same contract as requests' json= (NaN is not valid JSON)
+            body = gzip.compress(json.dumps(payload, allow_nan=False).encode('utf-8'), compresslevel=1)
+            response = session.post(
+                API_ENDPOINT,
+                data=body,
+                headers={
+                    'Content-Type': 'application/json',
+                    'Content-Encoding': 'gzip',
+                    'Accept-Encoding': 'gzip'
+                },
+                timeout=30
+            )
+            
+            status = response.status_code
+            if status in (400, 415):
+                # Stage rejected the compressed body - resend uncompressed and stop gzipping
+                transport["gzip"] = False
+                response = session.post(API_ENDPOINT, json=payload, timeout=30)
+            elif status >= 500 and status != 504 and not transport["probed_5xx"]:
+                # A proxy Lambda that can't decode gzip fails with 5xx. Probe once per
+                # process with a plain resend; never on 504 (Lambda timeout, would double the wait)
+                transport["probed_5xx"] = True
+                response = session.post(API_ENDPOINT, json=payload, timeout=30)
+                if response.status_code == 200:
+                    transport["gzip"] = False
+        else:
+            response = session.post(API_ENDPOINT, json=payload, timeout=30)
         
         if response.status_code == 200:
             return True, response.json()
@@ -81,6 +183,271 @@ def query_aws_api(asset_id, timeframes, report_date, scope_days, custom_ranges,
     except Exception as e:
         return False, str(e)
 
+async def _aquery(session, payload):
+    async with session.post(API_ENDPOINT, json=payload) as r:
+        if r.status != 200:
+            raise RuntimeError(f"API returned status {r.status}: {await r.text()}")
+        return await r.json()
+
+async def _run_all(payloads):
+    import aiohttp
+    
+    connector = aiohttp.TCPConnector(limit=8, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=30)
+    # Same NaN-rejecting JSON contract as the requests path
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        json_serialize=lambda obj: json.dumps(obj, allow_nan=False)
+    ) as s:
+        return await asyncio.gather(*[_aquery(s, p) for p in payloads])
+
+def _sort_merged_rows(rows, columns=None):
+    """Restore the single-query order (v31d: Range, Group, Output, Arrival) on merged rows"""
+    if not rows:
+        return rows
+    df = pd.DataFrame(rows, columns=columns) if columns else pd.DataFrame.from_records(rows)
+    arrival = 'Arrival_datetime' if 'Arrival_datetime' in df.columns else 'Arrival'
+    keys = [k for k in ('Range', 'Group', 'Output', arrival) if k in df.columns]
+    if not keys:
+        return rows
+    sort_df = df[keys].copy()
+    if arrival in sort_df.columns:
+        sort_df[arrival] = pd.to_datetime(sort_df[arrival], errors='coerce')
+    # Stable sort so rows that tie keep their per-timeframe order
+    order = sort_df.sort_values(keys, kind='mergesort', na_position='last').index
+    return [rows[i] for i in order]
+
+def query_aws_api_split(asset_id, timeframes, report_date, scope_days, custom_ranges, measurements):
+    """Query each timeframe as a separate concurrent API call and merge the results"""
+    try:
+        payloads = [
+            {
+                "asset_id": asset_id,
+                "timeframes": [tf],
+                "report_date": report_date,
+                "scope_days": scope_days,
+                "custom_ranges": custom_ranges,
+                "measurements": measurements
+            }
+            for tf in timeframes
+        ]
+        
+        results = asyncio.run(_run_all(payloads))
+        
+        columns = results[0].get("columns") if results else None
+        rows = [row for r in results for row in r.get("data", [])]
+        
+        merged = {
+            "data": _sort_merged_rows(rows, columns),
+            "count": sum(r.get("count", 0) for r in results),
+            "hlc_records_processed": sum(r.get("hlc_records_processed", 0) for r in results)
+        }
+        if columns:
+            merged["columns"] = columns
+        return True, merged
+    except Exception as e:
+        return False, str(e)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _cached_query(asset_id, timeframes_tuple, report_date, scope_days, custom_ranges_json, measurements_json,
+                  split_timeframes=False):
+    """Cached query_aws_api keyed on hashable payload parts (failures are not cached).
+
+    Returns (result, fetched_at) where fetched_at is the perf_counter time the
+    API call completed, so callers can tell a cache hit from a fresh query.
+    """
+    query_fn = query_aws_api_split if split_timeframes else query_aws_api
+    success, result = query_fn(
+        asset_id=asset_id,
+        timeframes=list(timeframes_tuple),
+        report_date=report_date,
+        scope_days=scope_days,
+        custom_ranges=json.loads(custom_ranges_json),
+        measurements=json.loads(measurements_json)
+    )
+    if not success:
+        raise RuntimeError(result)
+    return result, time.perf_counter()
+
+# === Measurement Parsing Helper ===
+@st.cache_data(show_spinner=False)
+def _parse_measurements(file_bytes: bytes) -> list[dict]:
+    """Parse the measurement workbook into the list of dicts sent to the API"""
+    # Rust-backed calamine is much faster when installed; otherwise pandas' default engine
+    try:
+        import python_calamine  # noqa: F401
+        measurements_df = pd.read_excel(io.BytesIO(file_bytes), sheet_name=0, engine='calamine')
+    except ImportError:
+        measurements_df = pd.read_excel(io.BytesIO(file_bytes), sheet_name=0)
+    
+    # Columns are uniform across rows, so resolve them once
+    m_val_col = next((c for c in ['M value', 'M Value', 'M_Value', 'm_value'] if c in measurements_df.columns), None)
+    m_name_col = next((c for c in ['M Name', 'M name', 'M_name', 'm_name'] if c in measurements_df.columns), None)
+    
+    if not m_val_col:
+        return []
+    
+    # Rows with a blank value are not measurements
+    measurements_df = measurements_df.dropna(subset=[m_val_col])
+    
+    # Build rows from plain lists (native Python scalars, JSON-serialisable)
+    default_names = "M" + measurements_df[m_val_col].astype(str)
+    vals = measurements_df[m_val_col].tolist()
+    names = (measurements_df[m_name_col].fillna(default_names) if m_name_col else default_names).tolist()
+    return [{"M_value": float(v), "M_name": n} for v, n in zip(vals, names)]
+
+# === Fast Single-Sheet XLSX Writer ===
+_XML_ESCAPE = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}
+    | {c: None for c in range(32) if c not in (9, 10, 13)}
+)
+_EXCEL_EPOCH = pd.Timestamp("1899-12-30")
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+# Style 0 = default, 1 = date (mm/dd/yyyy hh:mm), 2 = header (bold, green fill, border, wrap)
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="mm/dd/yyyy hh:mm"/></numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="3"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFD7E4BC"/></patternFill></fill></fills>'
+    '<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/><bottom style="thin"/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment vertical="top" wrapText="1"/></xf></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def _arrival_col(cols) -> int:
+    """Index of the Arrival column, or -1 if absent"""
+    try:
+        return list(cols).index("Arrival")
+    except ValueError:
+        return -1
+
+
+def _xlsx_col_letter(idx: int) -> str:
+    letters = ""
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _xlsx_cell(ref: str, value) -> str:
+    """Render one body cell of unknown type (used for object columns)"""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return ""
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, np.integer)):
+        return f'<c r="{ref}"><v>{int(value)}</v></c>'
+    if isinstance(value, (float, np.floating)):
+        return f'<c r="{ref}"><v>{float(value)!r}</v></c>' if np.isfinite(value) else ""
+    if isinstance(value, (dt.datetime, dt.date)):
+        serial = (pd.Timestamp(value).tz_localize(None) - _EXCEL_EPOCH) / pd.Timedelta(days=1)
+        return f'<c r="{ref}" s="1"><v>{serial!r}</v></c>'
+    text = str(value).translate(_XML_ESCAPE)
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_column_cells(col_letter: str, series: pd.Series) -> list:
+    """Render every body cell of one column, typed once per column"""
+    rows = range(2, len(series) + 2)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.dt.tz_localize(None) if series.dt.tz is not None else series
+        serials = ((values - _EXCEL_EPOCH) / pd.Timedelta(days=1)).tolist()
+        return [
+            "" if v != v else f'<c r="{col_letter}{r}" s="1"><v>{v!r}</v></c>'
+            for r, v in zip(rows, serials)
+        ]
+    if pd.api.types.is_bool_dtype(series) and not series.hasnans:
+        return [f'<c r="{col_letter}{r}" t="b"><v>{int(v)}</v></c>' for r, v in zip(rows, series.tolist())]
+    if pd.api.types.is_integer_dtype(series) and not series.hasnans:
+        return [f'<c r="{col_letter}{r}"><v>{v}</v></c>' for r, v in zip(rows, series.tolist())]
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        values = series.to_numpy(dtype=float, na_value=np.nan)
+        finite = np.isfinite(values)
+        return [
+            f'<c r="{col_letter}{r}"><v>{v!r}</v></c>' if ok else ""
+            for r, v, ok in zip(rows, values.tolist(), finite.tolist())
+        ]
+    return [_xlsx_cell(f"{col_letter}{r}", v) for r, v in zip(rows, series.tolist())]
+
+
+def _fast_single_sheet_xlsx(df: pd.DataFrame, buf, sheet_name: str = "Sheet1"):
+    """Write df as a single-sheet XLSX by emitting the sheet XML directly"""
+    letters = [_xlsx_col_letter(i) for i in range(len(df.columns))]
+
+    header = "".join(
+        f'<c r="{letter}1" s="2" t="inlineStr"><is><t xml:space="preserve">{str(name).translate(_XML_ESCAPE)}</t></is></c>'
+        for letter, name in zip(letters, df.columns)
+    )
+    columns = [_xlsx_column_cells(letter, df[c]) for letter, c in zip(letters, df.columns)]
+    body = "".join(
+        f'<row r="{r}">{"".join(cells)}</row>'
+        for r, cells in enumerate(zip(*columns), start=2)
+    )
+
+    cols_xml = ""
+    a_idx = _arrival_col(df.columns)
+    if a_idx >= 0:
+        cols_xml = f'<cols><col min="{a_idx + 1}" max="{a_idx + 1}" width="18" customWidth="1"/></cols>'
+
+    sheet_xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'{cols_xml}<sheetData><row r="1">{header}</row>{body}</sheetData>'
+        '</worksheet>'
+    )
+    workbook_xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{sheet_name.translate(_XML_ESCAPE)}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        zf.writestr("xl/workbook.xml", workbook_xml)
+        zf.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _XLSX_STYLES)
+        zf.writestr("xl/worksheets/sheet1.xml", sheet_xml)
+
 # === Unified Export Helper ===
 def render_unified_export(traveler_reports, report_time, asset_id=""):
     if not traveler_reports:
@@ -93,39 +460,101 @@ def render_unified_export(traveler_reports, report_time, asset_id=""):
     report_datetime_str = report_time.strftime("%d-%b-%y_%H-%M")
 
     def _coerce_arrival_datetime(df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
+        # Mutates in place - callers pass a frame they already own.
+        # Columns already parsed at ingest are reused without re-parsing.
         if "Arrival_datetime" in df.columns:
-            df["Arrival"] = pd.to_datetime(df["Arrival_datetime"], errors="coerce")
-        elif "Arrival" in df.columns:
-            df["Arrival"] = pd.to_datetime(df["Arrival"], errors="coerce", infer_datetime_format=True)
+            src = df["Arrival_datetime"]
+            df["Arrival"] = src if pd.api.types.is_datetime64_any_dtype(src) else pd.to_datetime(src.values, errors="coerce")
+        elif "Arrival" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["Arrival"]):
+            df["Arrival"] = pd.to_datetime(df["Arrival"].values, errors="coerce")
         return df
 
     excel_buffer = io.BytesIO()
-    with pd.ExcelWriter(excel_buffer, engine="xlsxwriter", datetime_format="mm/dd/yyyy hh:mm") as writer:
-        workbook = writer.book
-        header_fmt = workbook.add_format({
-            "bold": True, "text_wrap": True, "valign": "top",
-            "fg_color": "#D7E4BC", "border": 1
-        })
-        date_fmt = workbook.add_format({"num_format": "mm/dd/yyyy hh:mm"})
+    only_group = next(iter(traveler_reports.values()))
+    if len(traveler_reports) == 1 and isinstance(only_group, pd.DataFrame) and not only_group.empty:
+        # Single sheet: skip the Excel library and write the sheet XML directly
+        group_name = next(iter(traveler_reports))
+        sheet_name = group_name.replace(" ", "_").replace("-", "_")[:31]
+        export_data = _coerce_arrival_datetime(only_group.drop(columns=["Group"], errors="ignore"))
+        _fast_single_sheet_xlsx(export_data, excel_buffer, sheet_name)
+    else:
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+        from openpyxl.utils import get_column_letter
+
+        wb = openpyxl.Workbook(write_only=True)
+
+        # Register shared styles once per workbook; cells then reference them by name
+        thin = Side(style="thin")
+        wb.add_named_style(NamedStyle(
+            name="traveler_header",
+            font=Font(bold=True),
+            fill=PatternFill(fill_type="solid", fgColor="D7E4BC"),
+            alignment=Alignment(wrap_text=True, vertical="top"),
+            border=Border(left=thin, right=thin, top=thin, bottom=thin)
+        ))
+        wb.add_named_style(NamedStyle(name="traveler_date", number_format="mm/dd/yyyy hh:mm"))
 
         for group_name, group_data in traveler_reports.items():
             if not isinstance(group_data, pd.DataFrame) or group_data.empty:
                 continue
 
             sheet_name = group_name.replace(" ", "_").replace("-", "_")[:31]
-            export_data = group_data.drop(columns=["Group"], errors="ignore").copy()
+            export_data = group_data.drop(columns=["Group"], errors="ignore")
             export_data = _coerce_arrival_datetime(export_data)
 
-            export_data.to_excel(writer, sheet_name=sheet_name, index=False)
-            ws = writer.sheets[sheet_name]
-
-            for c, name in enumerate(export_data.columns):
-                ws.write(0, c, name, header_fmt)
-
-            if "Arrival" in export_data.columns:
-                a_idx = export_data.columns.get_loc("Arrival")
-                ws.set_column(a_idx, a_idx, 18, date_fmt)
+            ws = wb.create_sheet(title=sheet_name)
+
+            # Column widths must be set before any rows are streamed
+            a_idx = _arrival_col(export_data.columns)
+            if a_idx >= 0:
+                ws.column_dimensions[get_column_letter(a_idx + 1)].width = 18
+
+            # Header is written exactly once, as a single row
+            header = []
+            for name in export_data.columns:
+                cell = WriteOnlyCell(ws, value=ILLEGAL_CHARACTERS_RE.sub("", str(name)))
+                cell.style = "traveler_header"
+                header.append(cell)
+            ws.append(header)
+
+            # Blank out NaN/NaT so they are written as empty cells
+            rows_data = export_data.astype(object).where(export_data.notna(), None)
+            date_idxs = []
+            for i, c in enumerate(export_data.columns):
+                col = export_data[c]
+                if pd.api.types.is_datetime64_any_dtype(col):
+                    # Convert to naive python datetimes once instead of per cell
+                    if col.dt.tz is not None:
+                        col = col.dt.tz_localize(None)
+                    values = np.array(col.dt.to_pydatetime(), dtype=object)
+                    values[col.isna().to_numpy()] = None
+                    rows_data[c] = pd.Series(values, index=rows_data.index, dtype=object)
+                    date_idxs.append(i)
+                elif not pd.api.types.is_numeric_dtype(col):
+                    # openpyxl rejects control characters that Excel can't store
+                    rows_data[c] = pd.Series(
+                        [ILLEGAL_CHARACTERS_RE.sub("", v) if isinstance(v, str) else v for v in rows_data[c]],
+                        index=rows_data.index, dtype=object
+                    )
+
+            # Walk plain column arrays rather than building a tuple per row via pandas
+            cols = [rows_data[c].to_numpy() for c in rows_data.columns]
+            for row in zip(*cols):
+                if date_idxs:
+                    row = list(row)
+                    for i in date_idxs:
+                        if row[i] is not None:
+                            date_cell = WriteOnlyCell(ws, value=row[i])
+                            date_cell.style = "traveler_date"
+                            row[i] = date_cell
+                ws.append(row)
+
+        if not wb.worksheets:
+            wb.create_sheet()
+        wb.save(excel_buffer)
 
     excel_buffer.seek(0)
     total_entries = sum(len(df) for df in traveler_reports.values() if isinstance(df, pd.DataFrame))
@@ -193,8 +622,7 @@ if upload_mode == "Upload New Files":
     
     # Upload button
     if st.button("📤 Upload Files to AWS S3"):
-        uploaded_count = 0
-        upload_errors = []
+        results: list[tuple[bool, str, str]] = []
         
         with st.spinner("Uploading files to AWS S3..."):
             files_to_upload = [
@@ -206,22 +634,39 @@ if upload_mode == "Upload New Files":
                 (big_15m_file, "15m", "big"),
             ]
             
-            for file, timeframe, feed_type in files_to_upload:
-                if file is not None:
-                    success, result = upload_to_s3(file, asset_id, timeframe, feed_type)
-                    if success:
-                        uploaded_count += 1
-                        st.success(f"✅ Uploaded: {result}")
-                    else:
-                        upload_errors.append(f"❌ Failed to upload {file.name}: {result}")
+            pending = [(f, tf, ft) for f, tf, ft in files_to_upload if f is not None]
+            
+            # Snapshot bytes serially - UploadedFile is not guaranteed thread-safe
+            snapshots = [(io.BytesIO(f.getvalue()), f.name, tf, ft) for f, tf, ft in pending]
+            
+            # One client shared by all upload threads; missing credentials become upload errors
+            try:
+                s3_client = _create_s3_client() if snapshots else None
+            except Exception as e:
+                results.extend((False, str(e), name) for _, name, _, _ in snapshots)
+                snapshots = []
+            
+            # Uploads are independent network round trips - run them concurrently
+            if snapshots:
+                with ThreadPoolExecutor(max_workers=min(6, len(snapshots))) as ex:
+                    futures = {
+                        ex.submit(upload_to_s3, s3_client, buf, name, asset_id, tf, ft): name
+                        for buf, name, tf, ft in snapshots
+                    }
+                    for future in as_completed(futures):
+                        success, result = future.result()
+                        results.append((success, result, futures[future]))
         
-        if uploaded_count > 0:
-            st.success(f"✅ Successfully uploaded {uploaded_count} files!")
+        # Render once after all uploads finish instead of one element per file
+        uploaded = [result for ok, result, _ in results if ok]
+        upload_errors = [f"❌ Failed to upload {name}: {result}" for ok, result, name in results if not ok]
+        
+        if uploaded:
+            st.success(f"✅ Successfully uploaded {len(uploaded)} files:  \n" + "  \n".join(uploaded))
             st.info("⏳ AWS Lambda is now processing your files in the background. Wait 10-30 seconds, then run your query.")
         
         if upload_errors:
-            for error in upload_errors:
-                st.error(error)
+            st.error("  \n".join(upload_errors))
 
 # Measurement file
 st.markdown("### 📊 Measurement File")
@@ -277,8 +722,13 @@ timeframes = st.multiselect(
     help="Select which timeframes to include in the analysis"
 )
 
+split_timeframes = st.checkbox("Process Timeframes Separately", value=False,
+    help="Send one concurrent query per timeframe and merge the results")
+
 # Query button
 st.markdown("---")
+force_refresh = st.checkbox("🔄 Force refresh", value=False,
+    help="Ignore cached results and re-run the query on AWS")
 if st.button("🚀 Run AWS Query", type="primary"):
     if not measurement_file:
         st.error("Please upload a measurement file")
@@ -286,19 +736,7 @@ if st.button("🚀 Run AWS Query", type="primary"):
     
     # Load measurements
     try:
-        measurements_df = pd.read_excel(measurement_file, sheet_name=0)
-        
-        # Convert to list of dicts for API
-        measurements = []
-        for _, row in measurements_df.iterrows():
-            m_val_col = next((c for c in ['M value', 'M Value', 'M_Value', 'm_value'] if c in row.index), None)
-            m_name_col = next((c for c in ['M Name', 'M name', 'M_name', 'm_name'] if c in row.index), None)
-            
-            if m_val_col:
-                measurements.append({
-                    "M_value": row[m_val_col],
-                    "M_name": row[m_name_col] if m_name_col else f"M{row[m_val_col]}"
-                })
+        measurements = _parse_measurements(measurement_file.getvalue())
         
         st.info(f"Loaded {len(measurements)} measurements")
     except Exception as e:
@@ -322,39 +760,59 @@ if st.button("🚀 Run AWS Query", type="primary"):
     
     # Query AWS API
     with st.spinner("🔄 Querying AWS Lambda..."):
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        success, result = query_aws_api(
-            asset_id=asset_id,
-            timeframes=timeframes,
-            report_date=report_date_str,
-            scope_days=scope_days,
-            custom_ranges=custom_ranges,
-            measurements=measurements
-        )
+        if force_refresh:
+            _cached_query.clear()
+        
+        try:
+            result, fetched_at = _cached_query(
+                asset_id,
+                tuple(timeframes),
+                report_date_str,
+                scope_days,
+                json.dumps(custom_ranges, sort_keys=True),
+                json.dumps(measurements, sort_keys=True),
+                split_timeframes=split_timeframes
+            )
+            success = True
+            # A result fetched before this click started came from the cache
+            from_cache = fetched_at < start_time
+        except Exception as e:
+            success, result = False, str(e)
         
-        processing_time = time.time() - start_time
+        processing_time = time.perf_counter() - start_time
     
     if success:
         data = result.get('data', [])
         count = result.get('count', 0)
         hlc_processed = result.get('hlc_records_processed', 0)
         
-        st.success(f"✅ Query complete in {processing_time:.2f} seconds!")
+        if from_cache:
+            st.success("✅ Showing cached result (tick 'Force refresh' to re-run the query)")
+        else:
+            st.success(f"✅ Query complete in {processing_time:.2f} seconds!")
         
         # Display metrics
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric("Processing Time", f"{processing_time:.1f}s")
+            st.metric("Processing Time", "cached" if from_cache else f"{processing_time:.1f}s")
         with col2:
             st.metric("Traveler Entries", count)
         with col3:
             st.metric("HLC Records Processed", hlc_processed)
         
         if count > 0:
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
+            # Convert to DataFrame (columnar payload skips per-row dict hashing)
+            if 'columns' in result:
+                df = pd.DataFrame(data, columns=result['columns'])
+            else:
+                df = pd.DataFrame.from_records(data)
+            
+            # Parse datetimes once at ingest; cache=True dedupes repeated timestamp strings
+            for c in ('Arrival_datetime', 'Arrival'):
+                if c in df.columns:
+                    df[c] = pd.to_datetime(df[c], errors='coerce', cache=True)
             
             # Display data
             st.markdown("---")
@@ -365,13 +823,14 @@ if st.button("🚀 Run AWS Query", type="primary"):
             traveler_reports = {"Grp_All": df}
             render_unified_export(traveler_reports, report_time, asset_id)
             
-            # Performance comparison
-            st.markdown("---")
-            st.markdown("### ⚡ Performance Comparison")
-            local_time = 178  # Previous local processing time
-            speedup = local_time / processing_time if processing_time > 0 else 0
-            
-            st.info(f"**Local Processing:** ~{local_time}s  |  **AWS Lambda:** {processing_time:.1f}s  |  **Speedup:** {speedup:.1f}x faster!")
+            # Performance comparison (only meaningful for a fresh query)
+            if not from_cache:
+                st.markdown("---")
+                st.markdown("### ⚡ Performance Comparison")
+                local_time = 178  # Previous local processing time
+                speedup = local_time / processing_time if processing_time > 0 else 0
+                
+                st.info(f"**Local Processing:** ~{local_time}s  |  **AWS Lambda:** {processing_time:.1f}s  |  **Speedup:** {speedup:.1f}x faster!")
         else:
             st.warning("No traveler entries found matching the criteria")
     else:
@@ -405,3 +864,8 @@ st.sidebar.success("""
 ✅ ~$0-5/month cost
 ✅ Serverless - no maintenance
 """)
+
+# Warm the API connection once per browser session, after the page has rendered
+if not st.session_state.get("_api_warmed"):
+    st.session_state["_api_warmed"] = True
+    threading.Thread(target=_warm_api_connection, args=(_create_session(),), daemon=True).start()